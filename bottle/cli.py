@@ -1,6 +1,6 @@
 import click
 
-from . import play, parse, slackbot
+from . import multi, play, parse, replay, slackbot
 
 
 @click.group()
@@ -9,6 +9,9 @@ def main():
 
 
 main.add_command(parse.parse)
+main.add_command(parse.parse_benchmark)
 main.add_command(play.play)
 main.add_command(play.bulk)
+main.add_command(multi.multi)
+main.add_command(replay.replay)
 main.add_command(slackbot.slackbot)
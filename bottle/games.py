@@ -0,0 +1,134 @@
+from datetime import timedelta, date
+from functools import lru_cache
+import re
+from typing import NamedTuple, Tuple
+
+import click
+
+from .config import DAY_0
+
+
+# Feedback rows are stored as strings of these codes, one per letter
+GREY = "0"
+YELLOW = "1"
+GREEN = "2"
+
+# How each square can appear in a game. The high contrast colours are 🟧 (green) and 🟦 (yellow).
+FEEDBACK_CODES = {
+    "⬜\ufe0f": GREY,
+    ":white_large_square:": GREY,
+    ":black_large_square:": GREY,
+    ":large_yellow_square:": YELLOW,
+    ":large_blue_square:": YELLOW,
+    ":large_green_square:": GREEN,
+    ":large_orange_square:": GREEN,
+    "⬜": GREY,
+    "⬛": GREY,
+    "🟨": YELLOW,
+    "🟦": YELLOW,
+    "🟩": GREEN,
+    "🟧": GREEN,
+    "\ufe0f": "",
+}
+CODE_EMOJI = str.maketrans({GREY: "⬜", YELLOW: "🟨", GREEN: "🟩"})
+
+
+class RE:
+    _username = r"[ a-zA-Z.]+"
+    _timestamp = r"\d?\d:\d\d [AP]M"
+    _square = "|".join(re.escape(s) for s in FEEDBACK_CODES if s != "\ufe0f")
+    post_start = re.compile(rf"({_username})  {_timestamp}\s*$")
+    game_start = re.compile(r"Wordle #?(\d+) ([1-6]|X)/6(\*?)")
+    # A line of squares, or a blank line
+    row = re.compile(rf"\s*(?:(?:{_square})\ufe0f?)*\s*")
+
+
+@lru_cache(maxsize=4096)
+def decode_row(line):
+    """
+    Returns the codes for a line of feedback squares, "" for a blank line,
+    or None if it's anything else.
+    """
+    # Exports repeat the same few hundred rows over and over, hence the cache.
+    if not RE.row.fullmatch(line):
+        return None
+    line = line.strip()
+    for square, code in FEEDBACK_CODES.items():
+        if square in line:
+            line = line.replace(square, code)
+    return line
+
+
+class Game(NamedTuple):
+    username: str
+    number: int
+    hard_mode: bool
+    rows: Tuple[str, ...]
+
+    @property
+    def date(self) -> date:
+        return DAY_0 + timedelta(days=self.number)
+
+    @property
+    def solved(self):
+        return not self.rows[-1].strip(GREEN)
+
+    @property
+    def score(self):
+        return len(self.rows)
+
+    @property
+    def lines(self):
+        return tuple(row.translate(CODE_EMOJI) for row in self.rows)
+
+    def __str__(self):
+        u = click.style(self.username, fg="green", bold=True)
+        d = (
+            click.style("hard mode", fg="red", bold=True)
+            if self.hard_mode
+            else click.style("easy mode", fg="green", bold=True)
+        )
+        w = click.style(f"Wordle #{self.number} ({self.date})", fg="yellow", bold=True)
+        return "\n".join(
+            [
+                click.style(f"{u} played {w} in {d}"),
+                *self.lines,
+                "\n",
+            ]
+        )
+
+
+def read_games(text, username=None):
+    """
+    Yields the games found in the given text, e.g. a slack message or a whole export.
+
+    A game is a `Wordle 123 4/6*` line followed by its rows of feedback; blank lines are
+    skipped. Games cut short by any other line, or whose last row disagrees with the score,
+    are bad parses and are skipped.
+    Slack export `username  12:34 PM` lines set the username of the games after them.
+    """
+    # rows of the game we're in, if any
+    rows = None
+    for line in text.splitlines():
+        if rows is not None:
+            row = decode_row(line)
+            if row:
+                rows.append(row)
+                if len(rows) == num_rows:
+                    if (not row.strip(GREEN)) == solved:
+                        yield Game(username, number, hard_mode, tuple(rows))
+                    rows = None
+                continue
+            if row == "":
+                continue
+            # bad parse; this line might start something else though
+            rows = None
+        if m := RE.game_start.search(line):
+            # we're now in a game
+            number, score, hard_mode = int(m[1]), m[2], bool(m[3])
+            solved = score != "X"
+            num_rows = int(score) if solved else 6
+            rows = []
+        elif m := RE.post_start.match(line):
+            # we're now in a post
+            username = m[1]
@@ -0,0 +1,317 @@
+import random
+
+import click
+import ipdb
+
+from . import play as _play
+from .play import (
+    Board,
+    Failure,
+    GameBot,
+    get_char_weights,
+    get_consonant_score,
+    get_feedback,
+    get_reduction_factor,
+    get_today_number,
+    load_custom_words,
+    widen_chars,
+    word_list_options,
+)
+from .words import WordIndex
+
+
+def get_solutions(number: int, num_boards: int, words=None):
+    """
+    Picks the hidden words for multi-board puzzle `number`.
+    The same number always gives the same words for a given list.
+    """
+    click.echo(f"Loading {num_boards}-board puzzle #{number}")
+    if words is None:
+        _play._load_words()
+        words = _play.solutions
+    return random.Random(number).sample(words, num_boards)
+
+
+class BoardsIndex:
+    """
+    One WordIndex over the possible words of several boards, with each board's words in
+    its own range of bits.
+
+    A guess is scored on every board by assuming its chars are all missing, which rules out
+    the same chars everywhere except in each board's green positions and required chars.
+    Those are masked out up front, so one pass of ORs per guess finds the ruled out words on
+    every board, and only the popcount is done per board.
+
+    `boards` is a list of (board, count) pairs, for boards that appear `count` times.
+    """
+
+    def __init__(self, boards):
+        words = []
+        # (mask of the board's bits, number of words, count) for each board
+        self._boards = []
+        for board, count in boards:
+            start = len(words)
+            words.extend(board.possible_words)
+            in_board = (1 << len(words)) - (1 << start)
+            self._boards.append((in_board, len(board.possible_words), count))
+        index = WordIndex(words, boards[0][0].word_length)
+
+        self._char_masks = {}
+        # Sets of possible chars that a guess could rule out entirely, on any board.
+        # `Board.reduction_factor` assumes a green there instead, so guesses that cover
+        # one of these are left to the boards themselves.
+        self.coverable = []
+        for (board, _), (in_board, _, _) in zip(boards, self._boards):
+            open_positions = board.open_positions()
+            for char, mask in index.char_masks(open_positions).items():
+                if char not in board.required_chars:
+                    self._char_masks[char] = self._char_masks.get(char, 0) | (
+                        mask & in_board
+                    )
+            for i in open_positions:
+                x = board.possible_chars[i]
+                if len(x) <= board.word_length and not x & board.required_chars:
+                    self.coverable.append(x)
+
+    def reduction_factor(self, chars):
+        """
+        Returns the product of each board's `Board.reduction_factor` for a word made of
+        the given chars.
+        """
+        ruled_out = 0
+        for char in chars:
+            ruled_out |= self._char_masks.get(char, 0)
+        factor = 1.0
+        for in_board, num_words, count in self._boards:
+            remaining = num_words - (ruled_out & in_board).bit_count()
+            factor *= get_reduction_factor(num_words, remaining) ** count
+        return factor
+
+
+class MultiGameBot:
+    """
+    Plays several boards at once (quordle, octordle etc), guessing words until it has
+    solved every board or runs out of guesses. Each guess is played on every unsolved board.
+    """
+
+    CONSONANT_BOOST = GameBot.CONSONANT_BOOST
+
+    def __init__(
+        self,
+        number,
+        num_boards,
+        *,
+        debug_scores=False,
+        share=False,
+        use_solutions_list=False,
+        words=None,
+    ):
+        if words is None and use_solutions_list:
+            words = _play.solutions
+        elif words is None:
+            words = _play.dictionary
+        self.boards = [Board(words) for _ in range(num_boards)]
+        self.number = number
+        self.debug_scores = debug_scores
+        self.share = share
+        # You get one more guess per board than you'd need if every guess solved one.
+        self.max_guesses = num_boards + 5
+        self._overall_char_weights = get_char_weights(words)
+
+    def _score_words(self, boards):
+        """
+        Scores every word that's still possible on any of the given boards, in one pass.
+
+        A word's score is the product of the factors by which it reduces each board's problem
+        space (see `Board.reduction_factor`), i.e. the combined information over all the boards.
+        The per-word work (including finding which words it rules out, via `BoardsIndex`) is done
+        once per word rather than once per board. Boards in the same state (e.g. all of them,
+        before the first guess) are only counted once, and since the factors only depend on which
+        chars a word contains, words with the same chars share them too.
+        """
+        groups = {}
+        for board in boards:
+            groups.setdefault(board.state_key(), []).append(board)
+        groups = [(group[0], len(group)) for group in groups.values()]
+        index = BoardsIndex(groups)
+
+        candidates = set()
+        for board in boards:
+            candidates.update(board.possible_words)
+
+        factors = {}
+        word_scores = []
+        for word in candidates:
+            chars = frozenset(word)
+            factor = factors.get(chars)
+            if factor is None:
+                if any(x <= chars for x in index.coverable):
+                    # rare; let the boards handle their assumed greens
+                    factor = 1.0
+                    for board, count in groups:
+                        factor *= board.reduction_factor(word) ** count
+                else:
+                    factor = index.reduction_factor(chars)
+                factors[chars] = factor
+            # weight popular letters and consonants higher, as GameBot does
+            score = factor * sum(self._overall_char_weights[char] for char in word)
+            score *= get_consonant_score(word, self.CONSONANT_BOOST)
+            word_scores.append((score, word))
+        return word_scores
+
+    def get_best_scoring_word(self, boards):
+        for board in boards:
+            if len(board.possible_words) == 1:
+                # Nothing left to learn about this board; just solve it.
+                return board.possible_words[0]
+
+        word_scores = self._score_words(boards)
+        word_scores.sort(reverse=True)
+        if self.debug_scores:
+            for score, word in word_scores:
+                click.echo(f"            {word} -> {score:16.6f}")
+
+        return word_scores[0][1]
+
+    def produce_output(self, guesses, feedbacks, solved_at):
+        solved = all(solved_at)
+        n = max(solved_at) if solved else "X"
+        blank = "　" * self.boards[0].word_length
+
+        self.output = []
+        self.output.append(
+            f"{len(self.boards)}-board #{self.number} {n}/{self.max_guesses}*"
+        )
+        self.output.append(" ".join(str(i or "X") for i in solved_at) + "\n")
+        for guess, row in zip(guesses, feedbacks):
+            if not self.share:
+                self.output.append(guess)
+            self.output.append(" ".join(feedback or blank for feedback in row))
+
+        for line in self.output:
+            click.echo(line)
+
+    def __iter__(self):
+        guesses = []
+        feedbacks = []
+        # The guess number that solved each board, or None if it's unsolved
+        solved_at = [None] * len(self.boards)
+        for i in range(self.max_guesses):
+            unsolved = [b for b, n in zip(self.boards, solved_at) if n is None]
+            candidate = self.get_best_scoring_word(unsolved)
+            board_feedbacks = yield candidate
+            guesses.append(f"{widen_chars(candidate).upper()}")
+            row = []
+            for j, (board, feedback) in enumerate(zip(self.boards, board_feedbacks)):
+                if solved_at[j] is not None:
+                    row.append(None)
+                    continue
+                row.append(feedback)
+                if feedback == board.solved_feedback:
+                    solved_at[j] = i + 1
+                else:
+                    board.apply_feedback(candidate, feedback)
+            feedbacks.append(row)
+            if all(solved_at):
+                self.produce_output(guesses, feedbacks, solved_at)
+                return
+        self.produce_output(guesses, feedbacks, solved_at)
+        raise Failure
+
+
+def play_multi_game(bot, solutions):
+    bot_iter = iter(bot)
+    word = next(bot_iter)
+    guesses = 1
+    try:
+        while True:
+            word = bot_iter.send([get_feedback(word, s) for s in solutions])
+            guesses += 1
+    except StopIteration:
+        return guesses, 1
+    except Failure:
+        return guesses, 0
+
+
+@click.group()
+def multi():
+    """
+    Plays several boards at once, e.g. quordle (4 boards) or octordle (8 boards).
+    """
+
+
+@multi.command("play")
+@click.option("--boards", type=click.IntRange(min=1), default=4)
+@click.argument(
+    "number",
+    type=int,
+    nargs=1,
+    required=False,
+    default=get_today_number(),
+)
+@click.option("--share", is_flag=True)
+@click.option("--debug-scores", is_flag=True)
+@click.option("--use-solutions-list", is_flag=True)
+@word_list_options
+@click.pass_context
+def multi_play(
+    ctx,
+    boards,
+    number,
+    share,
+    debug_scores,
+    use_solutions_list,
+    words_file,
+    length,
+):
+    words = load_custom_words(words_file, length, use_solutions_list)
+    try:
+        solutions = get_solutions(number, boards, words)
+        bot = MultiGameBot(
+            number,
+            boards,
+            share=share,
+            debug_scores=debug_scores,
+            use_solutions_list=use_solutions_list,
+            words=words,
+        )
+        play_multi_game(bot, solutions)
+    except Exception:
+        ipdb.post_mortem()
+
+
+@multi.command("bulk")
+@click.option("--boards", type=click.IntRange(min=1), default=4)
+@click.option(
+    "-n", type=int, default=None, help="How many puzzles to do (default: all to date)"
+)
+@click.option("--debug-scores", is_flag=True)
+@click.option("--use-solutions-list", is_flag=True)
+@word_list_options
+@click.pass_context
+def multi_bulk(ctx, boards, n, debug_scores, use_solutions_list, words_file, length):
+    total_guesses = 0
+    successes = 0
+    if not n:
+        n = get_today_number()
+    words = load_custom_words(words_file, length, use_solutions_list)
+    try:
+        for number in range(1, n + 1):
+            solutions = get_solutions(number, boards, words)
+            bot = MultiGameBot(
+                number,
+                boards,
+                debug_scores=debug_scores,
+                use_solutions_list=use_solutions_list,
+                words=words,
+            )
+            guesses, success = play_multi_game(bot, solutions)
+            total_guesses += guesses
+            successes += success
+        click.secho(
+            f"Did {n} puzzles in {total_guesses} total guesses ({total_guesses/n:.1f} avg) "
+            f"(successes={successes} ({successes/n * 100:.2f}%)",
+            bold=True,
+        )
+    except Exception:
+        ipdb.post_mortem()
@@ -1,105 +1,76 @@
 #!/usr/bin/env python3
-from datetime import timedelta, date
-import re
+import io
+import random
+import time
 
 import click
 import ipdb
 
-from .config import DAY_0
+from .games import FEEDBACK_CODES, RE, Game, read_games
 
 
-class RE:
-    _username = r"[ a-zA-Z.]+"
-    _timestamp = r"\d?\d:\d\d [AP]M"
-    post_start = re.compile(rf"^({_username})  {_timestamp}\s*$", re.M)
-    game_start = re.compile(r"^Wordle (\d+) (\d|X)/6(\*?)\s*$")
-
-
-NICEN = {
-    ":white_large_square:": "⬜️",
-    ":black_large_square:": "⬜️",
-    ":large_yellow_square:": "🟨",
-    ":large_green_square:": "🟩",
-}
-
-
-def nicen(line):
-    for yuck, nice in NICEN.items():
-        line = line.replace(yuck, nice)
-    return line.strip()
-
-
-class Game:
-    def __init__(self, lines, username, number, hard_mode):
-        self.lines = tuple(lines)
-        self.username = username
-        self.number = number
-        self.date = DAY_0 + timedelta(days=number)
-        self.solved = self.lines[-1] == "🟩🟩🟩🟩🟩"
-        self.score = len(lines)
-        self.hard_mode = hard_mode
-
-    def __str__(self):
-        u = click.style(self.username, fg="green", bold=True)
-        d = (
-            click.style("hard mode", fg="red", bold=True)
-            if self.hard_mode
-            else click.style("easy mode", fg="green", bold=True)
-        )
-        w = click.style(f"Wordle #{self.number} ({self.date})", fg="yellow", bold=True)
-        return "\n".join(
-            [
-                click.style(f"{u} played {w} in {d}"),
-                *self.lines,
-                "\n",
-            ]
-        )
-
-
-def read_game(
-    input_file, username: str, number: int, num_lines: int, solved: bool, hard_mode
-):
-    lines = []
-    while len(lines) < num_lines:
-        line = input_file.readline().strip()
-        if not line:
-            continue
-        lines.append(nicen(line))
-    game = Game(lines, username, number, hard_mode)
-    assert game.solved == solved
-    assert game.score == num_lines
-    return game
+def find_games(input_file):
+    return read_games(input_file.read())
 
 
-def find_games(input_file):
-    last_username = None
-    while True:
-        line = input_file.readline()
-        if not line:
-            return
+def find_games_by_line(input_file):
+    """
+    The original parser, which reads a line at a time and trusts the score to say how many
+    rows follow. Kept as a baseline for `parse-benchmark`.
+    """
+    username = None
+    while line := input_file.readline():
         if m := RE.post_start.match(line):
-            # we're now in a post
-            last_username = m.group(1)
+            username = m[1]
         elif m := RE.game_start.match(line):
-            # we're now in a game
-            assert last_username
-            game_number = int(m.group(1))
-            if m.group(2) == "X":
-                num_lines = 6
-                solved = False
-            else:
-                num_lines = int(m.group(2))
-                solved = True
-            hard_mode = bool(m.group(3))
-            yield read_game(
-                input_file, last_username, game_number, num_lines, solved, hard_mode
-            )
+            solved = m[2] != "X"
+            num_rows = int(m[2]) if solved else 6
+            rows = []
+            while len(rows) < num_rows:
+                row = input_file.readline()
+                if not row:
+                    return
+                row = row.strip()
+                if not row:
+                    continue
+                for square, code in FEEDBACK_CODES.items():
+                    row = row.replace(square, code)
+                rows.append(row)
+            yield Game(username, int(m[1]), bool(m[3]), tuple(rows))
 
 
 def game_sort_key(g):
     return g.number, g.hard_mode, g.username
 
 
+def synthetic_export(num_games, seed=0):
+    """
+    Returns a slack export with `num_games` random games in it, for benchmarking.
+    Rows are a mix of emoji and slack :shortcodes:.
+    """
+    rng = random.Random(seed)
+    usernames = ["Alice", "Bob B.", "Carol", "Dave", "Erin", "Frank"]
+    squares = [
+        ["⬜️", "🟨", "🟩"],
+        [":white_large_square:", ":large_yellow_square:", ":large_green_square:"],
+    ]
+    out = io.StringIO()
+    for i in range(num_games):
+        out.write(f"{rng.choice(usernames)}  {i % 12 + 1}:{i % 60:02} PM\n")
+        score = rng.randint(1, 7)
+        hard_mode = "*" if rng.random() < 0.5 else ""
+        out.write(f"Wordle {i % 400} {score if score <= 6 else 'X'}/6{hard_mode}\n\n")
+        emoji = squares[i % 2]
+        for row in range(min(score, 6)):
+            if row == score - 1:
+                codes = [2] * 5
+            else:
+                codes = [rng.randint(0, 2) for _ in range(4)] + [0]
+            out.write("".join(emoji[c] for c in codes) + "\n")
+        out.write("\n")
+    return out.getvalue()
+
+
 @click.command()
 @click.argument("input_file", type=click.File(mode="r"))
 @click.pass_context
@@ -113,3 +84,21 @@ def parse(ctx, input_file):
             print(game)
     except Exception:
         ipdb.post_mortem()
+
+
+@click.command("parse-benchmark")
+@click.option("-n", type=int, default=100000, help="How many games to generate")
+@click.pass_context
+def parse_benchmark(ctx, n):
+    export = synthetic_export(n)
+    results = {}
+    for name, parser in [("line by line", find_games_by_line), ("parser", find_games)]:
+        start = time.perf_counter()
+        games = list(parser(io.StringIO(export)))
+        elapsed = time.perf_counter() - start
+        assert len(games) == n
+        results[name] = games
+        click.echo(
+            f"{name:>12}: {n} games in {elapsed:.2f}s ({n / elapsed:,.0f} games/sec)"
+        )
+    assert results["parser"] == results["line by line"]
@@ -2,9 +2,11 @@ from functools import lru_cache
 from hashlib import sha256
 import ipdb
 from collections import defaultdict
+import copy
 from enum import Enum, auto
 from datetime import date
 import json
+import random
 import re
 import string
 
@@ -12,9 +14,16 @@ import click
 import requests
 
 from .config import DAY_0
+from .scoring import score_words
+from .words import (
+    MAX_WORD_LENGTH,
+    MIN_WORD_LENGTH,
+    WordIndex,
+    load_word_file,
+    solved_feedback,
+)
 
 WIDE_CHAR_OFFSET = ord("ａ") - ord("a")
-SOLVED = "🟩🟩🟩🟩🟩"
 CONSONANTS = "bcdfghjklmnpwrstvwxyz"
 solutions = None
 dictionary = None
@@ -64,7 +73,213 @@ def get_todays_word(today_number: int = None):
     return solutions[today_number]
 
 
-class GameBot:
+def get_custom_word(number: int, words):
+    """
+    Picks the solution for puzzle `number` from a custom word list.
+    The same number always gives the same word for a given list.
+    """
+    click.echo(f"Loading puzzle #{number}")
+    return random.Random(number).choice(words)
+
+
+def load_custom_words(words_file, length, use_solutions_list=False):
+    """
+    Returns the custom word list to play with, or None to play the nytimes wordle.
+    """
+    if words_file is None:
+        if length != 5:
+            raise click.UsageError("--length requires a --words file")
+        return None
+    if use_solutions_list:
+        raise click.UsageError("--use-solutions-list can't be used with --words")
+    try:
+        return load_word_file(words_file, length)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+
+def get_solution(number: int, words=None):
+    if words is None:
+        return get_todays_word(number)
+    return get_custom_word(number, words)
+
+
+def get_char_weights(words):
+    """
+    Returns the overall frequency of each char in the given words.
+    """
+    char_counts = defaultdict(int)
+    for word in words:
+        for char in word:
+            char_counts[char] += 1
+    total = sum(char_counts.values())
+    return {char: (count / total) for (char, count) in char_counts.items()}
+
+
+def get_consonant_score(word, boost):
+    num_consonants = sum(boost for char in word if char in CONSONANTS)
+    return 1.0 + num_consonants**2
+
+
+def get_reduction_factor(num_words, remaining_words):
+    if remaining_words:
+        return num_words / remaining_words
+    # If no words remain, that's sort of good; it means this word is very likely to be
+    # the *only* remaining word (and hence is likely the solution!)
+    # However, we don't use inf because it can't be affected by maths later.
+    # so we use a high normal number instead
+    return 30.0
+
+
+class Board:
+    """
+    What we know so far about one hidden word, and which words still fit.
+    """
+
+    def __init__(self, words):
+        self.possible_words = list(words)
+        self.word_length = len(self.possible_words[0])
+        self.solved_feedback = solved_feedback(self.word_length)
+        self.possible_chars = [
+            set(string.ascii_lowercase) for _ in range(self.word_length)
+        ]
+        self.required_chars = set()
+        self._refresh_index()
+
+    def copy(self):
+        # The copy shares our index, if any, since indexes are never changed
+        board = copy.copy(self)
+        board.possible_words = list(self.possible_words)
+        board.possible_chars = [set(x) for x in self.possible_chars]
+        board.required_chars = set(self.required_chars)
+        return board
+
+    def _refresh_index(self):
+        # The index is only needed for scoring, so it's built when first used
+        self._index = None
+
+    def _build_index(self):
+        self._index = WordIndex(self.possible_words, self.word_length)
+        self._open_positions = self.open_positions()
+        self._char_masks = self._index.char_masks(self._open_positions)
+
+    def open_positions(self):
+        """
+        Returns the positions that scoring can still narrow down.
+        Positions with only one possible char are never narrowed further, so words can
+        only be ruled out by what they have in the other positions.
+        """
+        return [i for i, x in enumerate(self.possible_chars) if len(x) > 1]
+
+    def _refresh_possible_words(self):
+        if self._index is not None:
+            # Much quicker than checking every word, if we've already got an index
+            self.possible_words[:] = self._index.matching(
+                self.possible_chars, self.required_chars
+            )
+        else:
+            self.possible_words[:] = [
+                word for word in self.possible_words if self._is_possible(word)
+            ]
+        self._refresh_index()
+
+    def _is_possible(self, word, possible_chars=None):
+        if not set(word).issuperset(self.required_chars):
+            return False
+        if possible_chars is None:
+            possible_chars = self.possible_chars
+        for char, possibles in zip(word, possible_chars):
+            if char not in possibles:
+                # word is impossible
+                return False
+        return True
+
+    def state_key(self):
+        """
+        Returns a hashable key; boards with equal keys have the same possible words.
+        """
+        return (
+            tuple(frozenset(x) for x in self.possible_chars),
+            frozenset(self.required_chars),
+        )
+
+    def _count_remaining_words(self, chars_to_remove):
+        """
+        Returns how many possible words would remain if none of the given chars
+        are in the solution.
+        """
+        if self._index is None:
+            self._build_index()
+        # Every possible word already satisfies the current constraints, so a word is ruled
+        # out iff it has one of the removed chars in a position that isn't yet green.
+        ruled_out = 0
+        if any(self.possible_chars[i] <= chars_to_remove for i in self._open_positions):
+            # Let's just assume we'll get a green here.
+            # In practice this never seems to actually happen; I can run all 286 puzzles to date without hitting this condition :)
+            for i in self._open_positions:
+                x = self.possible_chars[i]
+                removed = x & chars_to_remove
+                if removed == x:
+                    removed.discard(next(iter(x)))
+                ruled_out |= self._index.mask(i, removed)
+        else:
+            for char in chars_to_remove:
+                ruled_out |= self._char_masks.get(char, 0)
+        return len(self._index) - self._index.count(ruled_out)
+
+    def reduction_factor(self, word):
+        """
+        Returns the *factor* by which guessing this word reduces the problem space,
+        assuming all its characters will be missing from the solution.
+        """
+        # These are the chars that we'll assume will give us no match.
+        chars_to_remove = set(word) - self.required_chars
+        return get_reduction_factor(
+            len(self.possible_words), self._count_remaining_words(chars_to_remove)
+        )
+
+    def words_with_feedback(self, feedback, solution):
+        """
+        Returns the possible words that would get the given feedback if `solution` is the answer.
+        """
+        if len(feedback) != self.word_length:
+            return []
+        if self._index is None:
+            self._build_index()
+        # get_feedback gives a 🟨 iff the char is one of the solution's chars where the
+        # feedback isn't 🟩. That makes each position independent, so the index can do it.
+        nongreens = {char for char, f in zip(solution, feedback) if f != "🟩"}
+        mask = (1 << len(self._index)) - 1
+        for i, (char, f) in enumerate(zip(solution, feedback)):
+            if f == "🟩":
+                mask &= self._index.mask(i, char)
+            elif f == "🟨":
+                mask &= self._index.mask(i, nongreens - {char})
+            else:
+                mask &= ~self._index.mask(i, nongreens)
+        return self._index.select(mask)
+
+    def apply_feedback(self, candidate, feedback):
+        for char, f, pc_set in zip(candidate, feedback, self.possible_chars):
+            if f == "⬜":
+                # this char can no longer be considered in any position
+                # EXCEPT if that position is already green
+                for x_feedback, x_possible in zip(feedback, self.possible_chars):
+                    if x_feedback != "🟩":
+                        x_possible.discard(char)
+            elif f == "🟩":
+                # this char is now the only possible candidate for this position
+                pc_set.intersection_update({char})
+                self.required_chars.discard(char)
+            elif f == "🟨":
+                # this char can no longer be considered in this position
+                pc_set.discard(char)
+                # Also, future guesses must include this char
+                self.required_chars.add(char)
+        self._refresh_possible_words()
+
+
+class GameBot(Board):
     """
     Plays the game, guessing words until it wins or loses.
     """
@@ -91,42 +306,33 @@ class GameBot:
         cache_starting_words=True,
         debug_scores=False,
         share=False,
+        quiet=False,
         use_solutions_list=False,
+        words=None,
+        jobs=1,
     ):
-        if use_solutions_list:
+        if words is None and use_solutions_list:
             # Use the solutions list as the dictionary. This means less stupid guesses
             # for words like 'GOMPA' that a human would know aren't really actually words.
             # However, it feels like 'cheating' in a way...
             # TODO: find another source of humanness, e.g. a word popularity score.
-            self.possible_words = solutions[:]
-        else:
-            self.possible_words = dictionary[:]
+            words = solutions
+        elif words is None:
+            words = dictionary
+        super().__init__(words)
 
-        self.possible_chars = [
-            set(string.ascii_lowercase),
-            set(string.ascii_lowercase),
-            set(string.ascii_lowercase),
-            set(string.ascii_lowercase),
-            set(string.ascii_lowercase),
-        ]
         self.number = number
-        self.required_chars = set()
         self.cache_starting_words = cache_starting_words
         self.debug_scores = debug_scores
         self.share = share
+        # Don't echo the finished game (`self.output` is still set)
+        self.quiet = quiet
         self._refresh_frequencies()
 
         # character frequences overall (we don't recalculate this later)
         # This is so that we're more likely to choose words with popular letters rather
         # than really uncommon ones
-        char_counts = defaultdict(int)
-        for word in self.possible_words:
-            for char in word:
-                char_counts[char] += 1
-        self._overall_char_weights = {
-            char: (count / sum(char_counts.values()))
-            for (char, count) in char_counts.items()
-        }
+        self._overall_char_weights = get_char_weights(self.possible_words)
         key = (
             self.__class__.__name__
             + sha256("\n".join(self.possible_words).encode()).hexdigest()
@@ -139,7 +345,18 @@ class GameBot:
                 self.starting_word = starting_words[key]
         except (FileNotFoundError, KeyError):
             click.echo("starting word not found in cache; chonking splerticles")
-            starting_words[key] = self.get_best_scoring_word(self.possible_words)
+            # This is by far the slowest step, so it's checkpointed and can be resumed.
+            word_scores = score_words(
+                self,
+                self.possible_words,
+                checkpoint=(
+                    f"starting-words.{key}.partial.jsonl"
+                    if self.cache_starting_words
+                    else None
+                ),
+                jobs=jobs,
+            )
+            starting_words[key] = self._best_scoring_word(word_scores)
             if self.cache_starting_words:
                 with open("starting-words.json", "w") as f:
                     f.write(json.dumps(starting_words, indent=4))
@@ -149,58 +366,17 @@ class GameBot:
         pass
 
     def _refresh_possible_words(self):
-        self.possible_words[:] = [
-            word for word in self.possible_words if self._is_possible(word)
-        ]
+        super()._refresh_possible_words()
         self._refresh_frequencies()
 
-    def _is_possible(self, word, possible_chars=None):
-        if not set(word).issuperset(self.required_chars):
-            return False
-        if possible_chars is None:
-            possible_chars = self.possible_chars
-        for char, possibles in zip(word, possible_chars):
-            if char not in possibles:
-                # word is impossible
-                return False
-        return True
-
     def _score_word(self, word):
         """
         Scores a word based on the assumption that all characters will be missing from the solution,
         and figures out how many of the dictionary words this word will rule out.
         The more words it rules out, the better this word scores.
         """
-        # These are the chars that we'll assume will give us no match.
-        chars_to_remove = set(word) - self.required_chars
-        other_chars = [x.copy() for x in self.possible_chars]
-        for x in other_chars:
-            if len(x) == 1:
-                # If the letter is already green, don't try to remove any chars.
-                continue
-            elif x <= chars_to_remove:
-                # Let's just assume we'll get a green here.
-                # In practice this never seems to actually happen; I can run all 286 puzzles to date without hitting this condition :)
-                assumed_green = list(x)[0]
-                x.difference_update(chars_to_remove)
-                x.add(assumed_green)
-            else:
-                x.difference_update(chars_to_remove)
-
-        remaining_words = [
-            other
-            for other in self.possible_words
-            if self._is_possible(other, possible_chars=other_chars)
-        ]
         # The score is the *factor* by which this word reduces the problem space.
-        try:
-            score = len(self.possible_words) / len(remaining_words)
-        except ZeroDivisionError:
-            # If no words remain, that's sort of good; it means this word is very likely to be
-            # the *only* remaining word (and hence is likely the solution!)
-            # However, we don't use inf because it can't be affected by maths later.
-            # so we use a high normal number instead
-            score = 30.0
+        score = self.reduction_factor(word)
 
         # weight popular letters higher
         score *= sum(self._overall_char_weights[char] for char in word)
@@ -220,14 +396,14 @@ class GameBot:
         #     ⬜🟩🟩🟩🟩
         #     ＢＯＵＮＤ
         #     ⬜🟩🟩🟩🟩
-        num_consonants = sum(
-            self.CONSONANT_BOOST for char in word if char in CONSONANTS
-        )
-        score *= 1.0 + num_consonants**2
+        score *= get_consonant_score(word, self.CONSONANT_BOOST)
         return score
 
     def get_best_scoring_word(self, words):
         word_scores = [(self._score_word(word), word) for word in self.possible_words]
+        return self._best_scoring_word(word_scores)
+
+    def _best_scoring_word(self, word_scores):
         word_scores.sort(reverse=True)
         if self.debug_scores:
             for score, word in word_scores:
@@ -236,7 +412,7 @@ class GameBot:
         return word_scores[0][1]
 
     def produce_output(self, guesses, feedbacks):
-        solved = feedbacks[-1] == SOLVED
+        solved = feedbacks[-1] == self.solved_feedback
         n = len(guesses) if solved else "X"
 
         self.output = []
@@ -249,8 +425,9 @@ class GameBot:
         i = len(guesses) - 1 if solved else -1
         self.output.append(self.SHARE_EMOJI[i])
 
-        for line in self.output:
-            click.echo(line)
+        if not self.quiet:
+            for line in self.output:
+                click.echo(line)
 
     def __iter__(self):
         guesses = []
@@ -264,26 +441,10 @@ class GameBot:
             feedback = yield candidate
             guesses.append(f"{widen_chars(candidate).upper()}")
             feedbacks.append(f"{feedback}")
-            if feedback == SOLVED:
+            if feedback == self.solved_feedback:
                 self.produce_output(guesses, feedbacks)
                 return
-            for char, f, pc_set in zip(candidate, feedback, self.possible_chars):
-                if f == "⬜":
-                    # this char can no longer be considered in any position
-                    # EXCEPT if that position is already green
-                    for x_feedback, x_possible in zip(feedback, self.possible_chars):
-                        if x_feedback != "🟩":
-                            x_possible.discard(char)
-                elif f == "🟩":
-                    # this char is now the only possible candidate for this position
-                    pc_set.intersection_update({char})
-                    self.required_chars.discard(char)
-                elif f == "🟨":
-                    # this char can no longer be considered in this position
-                    pc_set.discard(char)
-                    # Also, future guesses must include this char
-                    self.required_chars.add(char)
-            self._refresh_possible_words()
+            self.apply_feedback(candidate, feedback)
         self.produce_output(guesses, feedbacks)
         raise Failure
 
@@ -311,18 +472,12 @@ class WeightedScoreGameBot(GameBot):
         return simple_score * score_from_letter_frequency
 
     def _refresh_frequencies(self):
-        char_counts = [
-            defaultdict(int),
-            defaultdict(int),
-            defaultdict(int),
-            defaultdict(int),
-            defaultdict(int),
-        ]
+        char_counts = [defaultdict(int) for _ in range(self.word_length)]
         for word in self.possible_words:
             for i, char in enumerate(word):
                 char_counts[i][char] += 1
 
-        # character frequencies *in each of the five positions*
+        # character frequencies *in each position*
         self._char_frequencies = [
             {char: (count / sum(d.values())) for (char, count) in d.items()}
             for d in char_counts
@@ -335,30 +490,37 @@ class WeightedScoreGameBot(GameBot):
                 click.echo()
 
 
+def get_feedback(word, solution):
+    """
+    Returns the row of emoji that the game shows for guessing `word`.
+    """
+    feedback = []
+    nongreens_in_solution = {
+        soln_char
+        for i, (char, soln_char) in enumerate(zip(word, solution))
+        if char != soln_char
+    }
+    for i, (char, soln_char) in enumerate(zip(word, solution)):
+        if char == soln_char:
+            feedback.append("🟩")
+        elif char not in solution:
+            feedback.append("⬜")
+        else:
+            # Only give a 🟨 if we haven't already allocated a 🟩 for this char
+            if char in nongreens_in_solution:
+                feedback.append("🟨")
+            else:
+                feedback.append("⬜")
+    return "".join(feedback)
+
+
 def play_game(bot, solution):
     bot_iter = iter(bot)
     word = next(bot_iter)
     guesses = 1
     try:
         while True:
-            feedback = []
-            nongreens_in_solution = {
-                soln_char
-                for i, (char, soln_char) in enumerate(zip(word, solution))
-                if char != soln_char
-            }
-            for i, (char, soln_char) in enumerate(zip(word, solution)):
-                if char == soln_char:
-                    feedback.append("🟩")
-                elif char not in solution:
-                    feedback.append("⬜")
-                else:
-                    # Only give a 🟨 if we haven't already allocated a 🟩 for this char
-                    if char in nongreens_in_solution:
-                        feedback.append("🟨")
-                    else:
-                        feedback.append("⬜")
-            word = bot_iter.send("".join(feedback))
+            word = bot_iter.send(get_feedback(word, solution))
             guesses += 1
     except StopIteration:
         return guesses, 1
@@ -366,6 +528,23 @@ def play_game(bot, solution):
         return guesses, 0
 
 
+def word_list_options(f):
+    f = click.option(
+        "--length",
+        type=click.IntRange(MIN_WORD_LENGTH, MAX_WORD_LENGTH),
+        default=5,
+        help="Word length (requires --words)",
+    )(f)
+    f = click.option(
+        "--words",
+        "words_file",
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        help="Play with words from a local file, one per line (default: nytimes)",
+    )(f)
+    return f
+
+
 @click.command()
 @click.option(
     "--strategy",
@@ -383,10 +562,29 @@ def play_game(bot, solution):
 @click.option("--badly", is_flag=True)
 @click.option("--debug-scores", is_flag=True)
 @click.option("--use-solutions-list", is_flag=True)
+@word_list_options
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Processes to use when computing a new starting word",
+)
 @click.pass_context
-def play(ctx, strategy, number, share, badly, debug_scores, use_solutions_list):
+def play(
+    ctx,
+    strategy,
+    number,
+    share,
+    badly,
+    debug_scores,
+    use_solutions_list,
+    words_file,
+    length,
+    jobs,
+):
+    words = load_custom_words(words_file, length, use_solutions_list)
     try:
-        solution = get_todays_word(number)
+        solution = get_solution(number, words)
 
         if badly:
             bot_cls = LosingGameBot
@@ -398,6 +596,8 @@ def play(ctx, strategy, number, share, badly, debug_scores, use_solutions_list):
             debug_scores=debug_scores,
             cache_starting_words=not debug_scores,
             use_solutions_list=use_solutions_list,
+            words=words,
+            jobs=jobs,
         )
         play_game(bot, solution)
     except Exception:
@@ -415,19 +615,33 @@ def play(ctx, strategy, number, share, badly, debug_scores, use_solutions_list):
 )
 @click.option("--debug-scores", is_flag=True)
 @click.option("--use-solutions-list", is_flag=True)
+@word_list_options
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Processes to use when computing a new starting word",
+)
 @click.pass_context
-def bulk(ctx, strategy, n, debug_scores, use_solutions_list):
+def bulk(
+    ctx, strategy, n, debug_scores, use_solutions_list, words_file, length, jobs
+):
     total_guesses = 0
     successes = 0
     if not n:
         n = get_today_number()
+    words = load_custom_words(words_file, length, use_solutions_list)
     try:
         for number in range(1, n + 1):
-            solution = get_todays_word(number)
+            solution = get_solution(number, words)
 
             bot_cls = GameBot if strategy == "simple" else WeightedScoreGameBot
             bot = bot_cls(
-                number, debug_scores=debug_scores, use_solutions_list=use_solutions_list
+                number,
+                debug_scores=debug_scores,
+                use_solutions_list=use_solutions_list,
+                words=words,
+                jobs=jobs,
             )
             guesses, success = play_game(bot, solution)
             total_guesses += guesses
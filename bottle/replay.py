@@ -0,0 +1,245 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+import math
+
+import click
+import ipdb
+
+from . import play as _play
+from .parse import find_games
+from .play import Board, GameBot, WeightedScoreGameBot, play_game
+
+# Failed games count as this many guesses
+FAILED_SCORE = 7
+
+
+def _init_worker(solutions, dictionary):
+    _play.solutions = solutions
+    _play.dictionary = dictionary
+
+
+def _words(use_solutions_list):
+    return _play.solutions if use_solutions_list else _play.dictionary
+
+
+def make_bot(number, strategy="simple", use_solutions_list=False, jobs=1):
+    bot_cls = GameBot if strategy == "simple" else WeightedScoreGameBot
+    return bot_cls(
+        number, quiet=True, use_solutions_list=use_solutions_list, jobs=jobs
+    )
+
+
+def bot_score(number, strategy="simple", use_solutions_list=False):
+    """
+    Returns how many guesses the bot takes on the given puzzle (FAILED_SCORE if it fails).
+    """
+    bot = make_bot(number, strategy, use_solutions_list)
+    guesses, success = play_game(bot, _play.solutions[number])
+    return guesses if success else FAILED_SCORE
+
+
+@lru_cache(maxsize=2)
+def _start_board(use_solutions_list=False):
+    return Board(_words(use_solutions_list))
+
+
+@lru_cache(maxsize=1024)
+def _any_guess(number, line):
+    """
+    Returns the first dictionary word that gets the given feedback on the given puzzle,
+    or None if none do.
+    """
+    words = _start_board().words_with_feedback(line, _play.solutions[number])
+    return words[0] if words else None
+
+
+@lru_cache(maxsize=4096)
+def _board_after(number, lines, use_solutions_list=False):
+    """
+    Returns the board after playing a guess for each of the given rows of a game,
+    or None if no word gets one of the rows' feedback.
+
+    Boards are cached by the rows so far, so games that start the same way share
+    the work. They're shared, so they mustn't be changed; copy them instead.
+    """
+    if len(lines) > 1:
+        board = _board_after(number, lines[:-1], use_solutions_list)
+        if board is None:
+            return None
+    else:
+        board = _start_board(use_solutions_list)
+    line = lines[-1]
+    # This indexes the board, and the copy below shares the index
+    guesses = board.words_with_feedback(line, _play.solutions[number])
+    guess = guesses[0] if guesses else _any_guess(number, line)
+    if guess is None:
+        return None
+    board = board.copy()
+    board.apply_feedback(guess, line)
+    return board
+
+
+def count_candidates(number, lines, use_solutions_list=False):
+    """
+    Estimates how many candidate words were left after each row of a game, from its
+    feedback alone.
+
+    We don't know what the human guessed, only that each guess got that row's feedback.
+    So for each row we assume they played the first such word that was still a candidate
+    (or any such word, if none are), as a careful hard-mode player would.
+    The counts stop early if no word gets a row's feedback.
+    """
+    counts = []
+    for i in range(1, len(lines) + 1):
+        board = _board_after(number, lines[:i], use_solutions_list)
+        if board is None:
+            break
+        counts.append(len(board.possible_words))
+    return counts
+
+
+def _map(executor, fn, *iterables, chunksize=1):
+    if executor is None:
+        return map(fn, *iterables)
+    return executor.map(fn, *iterables, chunksize=chunksize)
+
+
+def replay_games(games, *, strategy="simple", use_solutions_list=False, jobs=1):
+    """
+    Returns a list of (game, bot_score, candidate_counts) for the given human games.
+
+    The bot plays each puzzle once, however many humans played it, and identical
+    games share their candidate counts.
+    """
+    numbers = sorted({game.number for game in games})
+    keys = sorted({(game.number, game.lines) for game in games})
+    if not numbers:
+        return []
+    # Make sure the starting word is cached before any workers go looking for it
+    make_bot(numbers[0], strategy, use_solutions_list, jobs)
+
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(
+            jobs,
+            initializer=_init_worker,
+            initargs=(_play.solutions, _play.dictionary),
+        )
+    try:
+        bot_scores = dict(
+            zip(
+                numbers,
+                _map(
+                    executor,
+                    bot_score,
+                    numbers,
+                    repeat(strategy),
+                    repeat(use_solutions_list),
+                ),
+            )
+        )
+        # Chunk the games so each worker gets runs of the same puzzle,
+        # and can reuse _board_after for games that start the same way.
+        counts = dict(
+            zip(
+                keys,
+                _map(
+                    executor,
+                    count_candidates,
+                    [number for number, _ in keys],
+                    [lines for _, lines in keys],
+                    repeat(use_solutions_list),
+                    chunksize=max(1, len(keys) // (jobs * 4)),
+                ),
+            )
+        )
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    return [
+        (game, bot_scores[game.number], counts[(game.number, game.lines)])
+        for game in games
+    ]
+
+
+def luck_and_skill_report(results, num_words):
+    """
+    Returns lines of a per-user report on how they played compared to the bot.
+
+    * `vs bot` is how many fewer guesses the user took than the bot, on average.
+    * `left@1` is how many candidates were left after their first guess.
+    * `luck` is log2 of how many candidates were left before their winning guess, on average,
+      i.e. how many bits of information they got for free by guessing right.
+    """
+    stats = defaultdict(lambda: defaultdict(float))
+    for game, bot_score, counts in results:
+        s = stats[game.username]
+        s["games"] += 1
+        s["score"] += game.score if game.solved else FAILED_SCORE
+        s["bot"] += bot_score
+        if counts:
+            s["left@1 games"] += 1
+            s["left@1"] += counts[0]
+        if game.solved and len(counts) == game.score:
+            left = counts[-2] if len(counts) > 1 else num_words
+            s["luck games"] += 1
+            s["luck"] += math.log2(left)
+
+    def avg(s, key, count_key="games"):
+        return s[key] / s[count_key] if s[count_key] else math.nan
+
+    lines = [
+        f"{'user':20} {'games':>6} {'score':>6} {'bot':>6} "
+        f"{'vs bot':>7} {'left@1':>7} {'luck':>6}"
+    ]
+    for username, s in sorted(stats.items(), key=lambda item: -item[1]["games"]):
+        lines.append(
+            f"{username:20} {int(s['games']):6d} {avg(s, 'score'):6.2f} {avg(s, 'bot'):6.2f} "
+            f"{avg(s, 'bot') - avg(s, 'score'):+7.2f} {avg(s, 'left@1', 'left@1 games'):7.1f} "
+            f"{avg(s, 'luck', 'luck games'):6.2f}"
+        )
+    return lines
+
+
+@click.command()
+@click.argument("input_file", type=click.File(mode="r"))
+@click.option(
+    "--strategy",
+    type=click.Choice(["weighted", "simple"]),
+    default="simple",
+)
+@click.option("--use-solutions-list", is_flag=True)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Processes to replay the games with",
+)
+@click.pass_context
+def replay(ctx, input_file, strategy, use_solutions_list, jobs):
+    """
+    Compares the humans' games in a slack export with the bot's games on the same puzzles.
+    """
+    try:
+        _play._load_words()
+        games = [
+            game
+            for game in find_games(input_file)
+            if game.username and game.number < len(_play.solutions)
+        ]
+        click.echo(f"loaded {len(games)} games")
+        results = replay_games(
+            games,
+            strategy=strategy,
+            use_solutions_list=use_solutions_list,
+            jobs=jobs,
+        )
+        for line in luck_and_skill_report(
+            results, len(_words(use_solutions_list))
+        ):
+            click.echo(line)
+    except Exception:
+        ipdb.post_mortem()
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+import json
+import os
+
+import click
+
+# Aim for about this many checkpoints over a whole run
+NUM_CHUNKS = 100
+MIN_CHUNK_SIZE = 50
+
+_worker_bot = None
+
+
+def _load_checkpoint(path):
+    """
+    Merges the chunks of scores saved in a checkpoint file, one JSON list of
+    [word, score] pairs per line.
+    """
+    scores = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    scores.update(json.loads(line))
+                except json.JSONDecodeError:
+                    # Cut off mid-write; those words just get scored again
+                    pass
+    except FileNotFoundError:
+        pass
+    return scores
+
+
+def _init_worker(bot):
+    global _worker_bot
+    _worker_bot = bot
+
+
+def _score_chunk(chunk, bot=None):
+    if bot is None:
+        bot = _worker_bot
+    return [(word, bot._score_word(word)) for word in chunk]
+
+
+def score_words(bot, words, *, checkpoint=None, jobs=1):
+    """
+    Scores each of the given words with `bot._score_word` and returns a list of
+    (score, word) tuples.
+
+    The words are scored in chunks, with a progress bar. If `checkpoint` is a path, each
+    chunk's scores are appended there as it's done, and a rerun with the same path picks up
+    where the last one left off; the file is removed once every word is scored.
+    With `jobs` > 1, the chunks are shared out between that many processes.
+    """
+    scores = _load_checkpoint(checkpoint) if checkpoint else {}
+    remaining = [word for word in words if word not in scores]
+    if scores:
+        click.echo(f"resuming from {checkpoint} ({len(scores)}/{len(words)} scored)")
+
+    chunk_size = max(MIN_CHUNK_SIZE, len(words) // NUM_CHUNKS)
+    chunks = [
+        remaining[i : i + chunk_size] for i in range(0, len(remaining), chunk_size)
+    ]
+    checkpoint_file = open(checkpoint, "a") if checkpoint else nullcontext()
+    with checkpoint_file as f, click.progressbar(
+        length=len(remaining), label="scoring words", show_eta=True, show_pos=True
+    ) as bar:
+
+        def done(chunk_scores):
+            scores.update(chunk_scores)
+            if f:
+                f.write(json.dumps(chunk_scores) + "\n")
+                f.flush()
+            bar.update(len(chunk_scores))
+
+        try:
+            if jobs > 1 and len(chunks) > 1:
+                executor = ProcessPoolExecutor(
+                    jobs, initializer=_init_worker, initargs=(bot,)
+                )
+                try:
+                    futures = [executor.submit(_score_chunk, chunk) for chunk in chunks]
+                    for future in as_completed(futures):
+                        done(future.result())
+                finally:
+                    executor.shutdown(cancel_futures=True)
+            else:
+                for chunk in chunks:
+                    done(_score_chunk(chunk, bot))
+        except KeyboardInterrupt:
+            if checkpoint:
+                click.echo(f"\ninterrupted; run again to resume from {checkpoint}")
+            raise
+
+    if checkpoint:
+        try:
+            os.remove(checkpoint)
+        except FileNotFoundError:
+            pass
+    return [(scores[word], word) for word in words]
@@ -1,4 +1,3 @@
-from datetime import timedelta
 import json
 import os
 import re
@@ -10,7 +9,7 @@ from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
 
-from .config import DAY_0
+from .games import RE, read_games
 from .play import get_todays_word, get_today_number, GameBot, LosingGameBot, play_game
 
 try:
@@ -22,80 +21,16 @@ except FileNotFoundError:
 app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
 
 
-NICEN = {
-    ":white_large_square:": "⬜️",
-    ":black_large_square:": "⬜️",
-    ":large_yellow_square:": "🟨",
-    ":large_green_square:": "🟩",
-}
-
-
-def nicen(line):
-    for yuck, nice in NICEN.items():
-        line = line.replace(yuck, nice)
-    return line.strip()
-
-
-class Game:
-    def __init__(self, lines, username, number, hard_mode):
-        self.lines = tuple(lines)
-        self.username = username
-        self.number = number
-        self.date = DAY_0 + timedelta(days=number)
-        self.solved = self.lines[-1] == "🟩🟩🟩🟩🟩"
-        self.score = len(lines)
-        self.hard_mode = hard_mode
-
-    def __str__(self):
-        u = click.style(self.username, fg="green", bold=True)
-        d = (
-            click.style("hard mode", fg="red", bold=True)
-            if self.hard_mode
-            else click.style("easy mode", fg="green", bold=True)
-        )
-        w = click.style(f"Wordle #{self.number} ({self.date})", fg="yellow", bold=True)
-        return "\n".join(
-            [
-                click.style(f"{u} played {w} in {d}"),
-                *self.lines,
-                "\n",
-            ]
-        )
-
-
 @lru_cache()
 def get_username(user_id):
     return app.client.users_info(user=user_id).data["user"]["name"]
 
 
-@app.message(re.compile(r"Wordle #(\d+) (\d|X)/6(\*)?"))
+@app.message(RE.game_start)
 def on_user_played_wordle(message, say, context):
     username = get_username(message["user"])
-
-    m = context["matches"]
-    number = int(m[0])
-    solved = m[1] != "X"
-    num_lines = int(m[1]) if solved else 6
-    hard_mode = bool(m[2])
-
-    lines = [nicen(line) for line in message["text"].splitlines()]
-    lines = [line for line in lines if line]
-
-    for i, line in enumerate(lines):
-        if line.startswith("Wordle #"):
-            break
-    else:
-        # bad parse
-        return
-    lines = lines[i + 1 : i + num_lines + 1]
-    if len(lines) != num_lines:
-        # bad parse
-        return
-
-    game = Game(lines, username, number, hard_mode)
-    assert game.solved == solved
-    assert game.score == num_lines
-    print(game)
+    for game in read_games(message["text"], username):
+        print(game)
 
 
 def _mentions_me(block_or_element, bot_user_id):
@@ -0,0 +1,108 @@
+from itertools import compress
+import string
+
+MIN_WORD_LENGTH = 4
+MAX_WORD_LENGTH = 8
+
+
+def solved_feedback(word_length):
+    return "🟩" * word_length
+
+
+def load_word_file(path, word_length):
+    """
+    Loads a word list from a local file, one word per line.
+
+    Words that aren't exactly `word_length` ASCII letters long are skipped.
+    """
+    letters = set(string.ascii_lowercase)
+    with open(path, "r") as f:
+        words = {line.strip().lower() for line in f}
+    words = sorted(
+        word for word in words if len(word) == word_length and set(word) <= letters
+    )
+    if not words:
+        raise ValueError(f"No {word_length}-letter words found in {path}")
+    return words
+
+
+# Turns a reversed bin() string into the bytes 0 and 1
+_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _bitmask(indexes, size):
+    buf = bytearray((size + 7) // 8)
+    for n in indexes:
+        buf[n >> 3] |= 1 << (n & 7)
+    return int.from_bytes(buf, "little")
+
+
+class WordIndex:
+    """
+    A bitset index over a list of equal-length words.
+
+    For each position and char there's an int whose bit `n` is set iff `words[n]` has that
+    char at that position. Counting the words ruled out by a set of (position, char) pairs is
+    then a handful of big-int ORs and a popcount, rather than a scan over every word.
+    """
+
+    def __init__(self, words, word_length):
+        # Our own copy, so the index stays right if the caller's list changes
+        self.words = list(words)
+        self.word_length = word_length
+        indexes = [{} for _ in range(word_length)]
+        for n, word in enumerate(words):
+            for position, char in zip(indexes, word):
+                position.setdefault(char, []).append(n)
+        self._masks = [
+            {char: _bitmask(ns, len(words)) for (char, ns) in position.items()}
+            for position in indexes
+        ]
+
+    def __len__(self):
+        return len(self.words)
+
+    def mask(self, position, chars):
+        """
+        Returns a mask of the words with any of the given chars at the given position.
+        """
+        masks = self._masks[position]
+        result = 0
+        for char in chars:
+            result |= masks.get(char, 0)
+        return result
+
+    def char_masks(self, positions):
+        """
+        Returns a dict mapping each char to a mask of the words which have that char
+        in any of the given positions.
+        """
+        result = {}
+        for position in positions:
+            for char, mask in self._masks[position].items():
+                result[char] = result.get(char, 0) | mask
+        return result
+
+    def select(self, mask):
+        """
+        Returns the words whose bits are set in the mask, in order.
+        """
+        return list(compress(self.words, bin(mask)[:1:-1].encode().translate(_BITS)))
+
+    def matching(self, possible_chars, required_chars):
+        """
+        Returns the words with one of `possible_chars[i]` at each position i, and with
+        every one of `required_chars` somewhere.
+        """
+        mask = (1 << len(self.words)) - 1
+        for position, chars in enumerate(possible_chars):
+            mask &= self.mask(position, chars)
+        if required_chars:
+            masks = self.char_masks(range(self.word_length))
+            for char in required_chars:
+                mask &= masks.get(char, 0)
+        return self.select(mask)
+
+    @staticmethod
+    def count(mask):
+        return mask.bit_count()
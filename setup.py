@@ -8,6 +8,7 @@ setup(
     author="Craig de Stigter",
     author_email="craig@destigter.nz",
     license="MIT",
+    python_requires=">=3.10",
     packages=["bottle"],
     include_package_data=True,
     install_requires=["click", "requests", "ipdb", "slack_bolt", "pyyaml"],